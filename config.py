@@ -23,6 +23,16 @@ HEADERS = {
     'Connection': 'keep-alive',
 }
 
+# Logging configuration
+LOG_FILE = os.getenv('LOG_FILE', 'scraper.log')
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(5 * 1024 * 1024)))  # Rotate at 5 MB
+LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '3'))
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', '20'))  # Keep 1 in N repetitive per-listing messages
+LOG_DEBUG_CAPTURE = os.getenv('LOG_DEBUG_CAPTURE', 'false').lower() in ('1', 'true', 'yes')
+LOG_CAPTURE_DIR = os.getenv('LOG_CAPTURE_DIR', 'html_captures')
+LOG_CAPTURE_MAX_FILES = int(os.getenv('LOG_CAPTURE_MAX_FILES', '20'))  # Keep only the newest N captures
+
 # Real estate websites to scrape
 WEBSITES = [
     {
@@ -0,0 +1,180 @@
+import atexit
+import copy
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+import config
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listener = None
+_sampler = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage().strip(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """QueueHandler that keeps the traceback separate from the message.
+
+    The base class merges the traceback into `msg`; here the message is only
+    interpolated with its args and the traceback is kept as `exc_text`, which
+    both the JSON and console formatters render on their own.
+    """
+
+    def prepare(self, record):
+        # Copy so other handlers in the chain still see the original record
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.message = record.msg
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        # Traceback objects are not safe to hand to another thread
+        record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Let through only every Nth record that shares a `sample_key`.
+
+    Records logged without `extra={'sample_key': ...}` always pass. The first
+    record for each key passes, then one in every `every` after that, so
+    repetitive per-listing messages keep a trace without flooding the log.
+    """
+
+    def __init__(self, every):
+        super().__init__()
+        self.every = max(1, every)
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def should_sample(self, key):
+        """Count one occurrence of `key` and return whether it is kept"""
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        return count % self.every == 0
+
+    def filter(self, record):
+        key = getattr(record, 'sample_key', None)
+        if key is None or record.levelno >= logging.WARNING:
+            return True
+        if not self.should_sample(key):
+            return False
+        record.sampled_every = self.every
+        return True
+
+
+def should_sample(key: str) -> bool:
+    """Decide up front whether an occurrence of `key` will be logged.
+
+    Use this instead of `extra={'sample_key': ...}` when building the record
+    is itself expensive, e.g. when it involves an HTML capture.
+    """
+    if _sampler is None:
+        return True
+    return _sampler.should_sample(key)
+
+
+def setup_logging():
+    """Route all logging through a background queue writer.
+
+    The scraping thread only enqueues records; a QueueListener thread does the
+    formatting and writes to the rotating JSON log file and the console.
+    """
+    global _listener, _sampler
+    if _listener is not None:
+        return
+
+    file_handler = RotatingFileHandler(
+        config.LOG_FILE,
+        maxBytes=config.LOG_MAX_BYTES,
+        backupCount=config.LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter('%(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    _sampler = SamplingFilter(config.LOG_SAMPLE_EVERY)
+    queue_handler.addFilter(_sampler)
+
+    root = logging.getLogger()
+    root.setLevel(config.LOG_LEVEL)
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    # Filter out WebDriver manager logs
+    logging.getLogger('WDM').setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush queued records and stop the background writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def dump_html(name: str, html) -> Optional[str]:
+    """Write an HTML snapshot to a gzip file when debug capture is enabled.
+
+    Only the newest LOG_CAPTURE_MAX_FILES captures are kept. Returns the path
+    of the written file, or None when capture is disabled.
+    """
+    if not config.LOG_DEBUG_CAPTURE:
+        return None
+    try:
+        os.makedirs(config.LOG_CAPTURE_DIR, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        path = os.path.join(config.LOG_CAPTURE_DIR, f"{timestamp}-{name}.html.gz")
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(str(html))
+        _prune_captures()
+        return path
+    except Exception as e:
+        logging.error(f"Error writing HTML capture {name}: {str(e)}")
+        return None
+
+
+def _prune_captures():
+    """Delete the oldest captures beyond LOG_CAPTURE_MAX_FILES"""
+    # File names start with a timestamp, so name order is age order
+    captures = sorted(f for f in os.listdir(config.LOG_CAPTURE_DIR) if f.endswith('.html.gz'))
+    keep = max(1, config.LOG_CAPTURE_MAX_FILES)
+    for name in captures[:-keep]:
+        os.remove(os.path.join(config.LOG_CAPTURE_DIR, name))
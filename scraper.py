@@ -16,19 +16,10 @@ import re
 import logging
 import hashlib
 import requests
+from log_setup import setup_logging, should_sample, dump_html
 
 # Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(message)s',
-    handlers=[
-        logging.FileHandler('scraper.log'),
-        logging.StreamHandler()
-    ]
-)
-
-# Filter out WebDriver manager logs
-logging.getLogger('WDM').setLevel(logging.WARNING)
+setup_logging()
 
 class RealEstateScraper:
     def __init__(self):
@@ -312,11 +303,13 @@ class RealEstateScraper:
             
             # Process each listing
             results = []
-            for listing in listings:
+            for i, listing in enumerate(listings):
                 try:
-                    # Debug: Print the first listing's HTML
-                    if len(results) == 0:
-                        logging.info(f"First listing HTML: {listing}")
+                    # Debug: Capture the first listing's HTML
+                    if i == 0:
+                        path = dump_html('first-listing', listing)
+                        if path:
+                            logging.info("First listing HTML captured", extra={'capture_file': path})
                     
                     # Extract listing details
                     title = listing.select_one(self.config['selector']['title']).text.strip()
@@ -341,9 +334,11 @@ class RealEstateScraper:
                     location_tag = listing.select_one(self.config['selector']['location'])
                     if location_tag:
                         location = location_tag.text.strip()
-                        logging.info(f"Found location: {location}")
-                    else:
-                        logging.info(f"Location tag not found. HTML: {listing}")
+                        logging.debug("Found location: %s", location,
+                                      extra={'sample_key': 'location_found'})
+                    elif should_sample('location_missing'):
+                        logging.info("Location tag not found for %s", link,
+                                     extra={'capture_file': dump_html('missing-location', listing)})
                     
                     # Generate a unique hash for this listing
                     listing_hash = self.generate_listing_hash(title, price, currency, link)
@@ -0,0 +1,50 @@
+import json
+import logging
+import os
+
+import config
+import log_setup
+
+
+def make_record(level=logging.INFO, msg='message', **extra):
+    record = logging.LogRecord('test', level, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_sampling_keeps_first_and_every_nth():
+    sampler = log_setup.SamplingFilter(3)
+    kept = [sampler.filter(make_record(sample_key='listing')) for _ in range(7)]
+    assert kept == [True, False, False, True, False, False, True]
+
+
+def test_sampling_always_passes_warnings_and_unkeyed_records():
+    sampler = log_setup.SamplingFilter(100)
+    sampler.filter(make_record(sample_key='listing'))
+    assert sampler.filter(make_record(logging.WARNING, sample_key='listing'))
+    assert sampler.filter(make_record(logging.ERROR, sample_key='listing'))
+    assert sampler.filter(make_record())
+    assert sampler.filter(make_record())
+
+
+def test_json_formatter_emits_extra_fields():
+    record = make_record(msg='Location tag not found', capture_file='capture.html.gz')
+    entry = json.loads(log_setup.JsonFormatter().format(record))
+    assert entry['message'] == 'Location tag not found'
+    assert entry['level'] == 'INFO'
+    assert entry['capture_file'] == 'capture.html.gz'
+
+
+def test_dump_html_disabled_returns_none(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, 'LOG_DEBUG_CAPTURE', False)
+    monkeypatch.setattr(config, 'LOG_CAPTURE_DIR', str(tmp_path / 'captures'))
+    assert log_setup.dump_html('listing', '<article></article>') is None
+    assert not (tmp_path / 'captures').exists()
+
+
+def test_dump_html_keeps_newest_captures(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, 'LOG_DEBUG_CAPTURE', True)
+    monkeypatch.setattr(config, 'LOG_CAPTURE_DIR', str(tmp_path))
+    monkeypatch.setattr(config, 'LOG_CAPTURE_MAX_FILES', 2)
+    paths = [log_setup.dump_html('listing', f'<article>{i}</article>') for i in range(4)]
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(os.path.basename(p) for p in paths[-2:])